@@ -1,6 +1,7 @@
 import pytest
 import json
 import os
+import signal
 import tempfile
 
 # import the module under test
@@ -8,6 +9,18 @@ import youtube_manager as ym
 # or import specific symbols you need, for example:
 # from youtube_manager import load_videos, save_videos, add_video
 
+@pytest.fixture(autouse=True)
+def fresh_module_state(monkeypatch):
+    # Caches and pending-save state are module globals; give every test a clean slate
+    monkeypatch.setattr(ym, "_id_index", {})
+    monkeypatch.setattr(ym, "_id_index_owner", None)
+    monkeypatch.setattr(ym, "_id_index_size", 0)
+    monkeypatch.setattr(ym, "_next_id_cache", None)
+    monkeypatch.setattr(ym, "_dirty_videos", None)
+    monkeypatch.setattr(ym, "_search_index", {})
+    monkeypatch.setattr(ym, "_search_blob", None)
+    monkeypatch.setattr(ym, "_last_save", 0.0)
+
 @pytest.fixture
 def tmp_data_file(tmp_path, monkeypatch):
     # Create a temp file path
@@ -76,3 +89,277 @@ def test_update_and_delete(tmp_data_file):
     loaded = ym.load_data(ym.DATA_FILE)
     assert len(loaded) == 1
     assert loaded[0]["id"] == 2
+
+def test_search_file(tmp_data_file):
+    videos = [
+        {"id": 1, "name": "Python Basics", "time": "1:00", "description": "", "tags": []},
+        {"id": 2, "name": "Cooking", "time": "2:00", "description": "learn python pasta", "tags": []},
+        {"id": 3, "name": "Music", "time": "3:00", "description": "", "tags": []},
+    ]
+    ym.save_data_atomic(videos, ym.DATA_FILE)
+    hits = ym.search_file("PYTHON", ym.DATA_FILE)
+    assert [v["id"] for v in hits] == [1, 2]
+    assert ym.search_file("nothing", ym.DATA_FILE) == []
+
+def test_find_index_by_id_after_delete(tmp_data_file, monkeypatch):
+    videos = [{"id": i, "name": str(i), "time": "", "description": "", "tags": []} for i in range(1, 5)]
+    ym.save_data_atomic(videos, ym.DATA_FILE)
+    videos = ym.load_data(ym.DATA_FILE)
+    assert ym.find_index_by_id(videos, 3) == 2
+
+    answers = iter(["2", "yes"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    ym.delete_video(videos)
+    assert [v["id"] for v in videos] == [1, 3, 4]
+    assert ym.find_index_by_id(videos, 2) is None
+    assert ym.find_index_by_id(videos, 4) == 2
+
+    # The delete is only written out once pending changes are flushed
+    assert len(ym.load_data(ym.DATA_FILE)) == 4
+    ym.flush()
+    assert [v["id"] for v in ym.load_data(ym.DATA_FILE)] == [1, 3, 4]
+
+def test_search_videos_sees_edits(tmp_data_file, monkeypatch, capsys):
+    videos = [
+        {"id": 1, "name": "Python Basics", "time": "1:00", "description": "", "tags": []},
+        {"id": 2, "name": "Cooking", "time": "2:00", "description": "", "tags": []},
+    ]
+    answers = iter([
+        "python",
+        "1", "Rust Basics", "", "", "",
+        "2", "", "", "Python pasta", "",
+        "python",
+        "2",
+    ])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    ym.search_videos(videos)
+    assert "Python Basics" in capsys.readouterr().out
+
+    ym.update_video(videos)
+    ym.update_video(videos)
+    capsys.readouterr()
+    ym.search_videos(videos)
+    out = capsys.readouterr().out
+    assert "Rust Basics" not in out
+    assert "Cooking" in out
+
+    # Ids are not searchable text
+    ym.search_videos(videos)
+    assert "No matches found." in capsys.readouterr().out
+
+def test_load_data_normalizes_ids(tmp_data_file):
+    with open(ym.DATA_FILE, "w", encoding="utf-8") as f:
+        json.dump([{"id": "3", "name": "A"}, "junk", {"name": "B"}, {"id": "x", "name": "C"}], f)
+    loaded = ym.load_data(ym.DATA_FILE)
+    assert [v["id"] for v in loaded] == [3, 4, 5]
+    assert ym.next_id(loaded) == 6
+    assert ym.find_index_by_id(loaded, 3) == 0
+
+def test_flush_keeps_changes_pending_on_failure(tmp_path, monkeypatch):
+    videos = [{"id": 1, "name": "A", "time": "", "description": "", "tags": []}]
+    monkeypatch.setattr(ym, "DATA_FILE", str(tmp_path / "missing-dir" / "videos.json"))
+    ym._mark_dirty(videos)
+    assert not ym.flush()
+    assert ym._dirty_videos is videos
+
+    monkeypatch.setattr(ym, "DATA_FILE", str(tmp_path / "videos.json"))
+    assert ym.flush()
+    assert ym._dirty_videos is None
+    assert ym.load_data(ym.DATA_FILE) == videos
+
+def test_find_index_by_id_first_duplicate_wins():
+    videos = [{"id": 1, "name": "A"}, {"id": 2, "name": "B"}, {"id": 1, "name": "C"}]
+    assert ym.find_index_by_id(videos, 1) == 0
+    assert ym.find_index_by_id(videos, 3) is None
+    # A direct append (length change) is picked up
+    videos.append({"id": 3, "name": "D"})
+    assert ym.find_index_by_id(videos, 3) == 3
+
+def test_delete_first_duplicate_exposes_later_one(monkeypatch):
+    videos = [{"id": 1, "name": "A"}, {"id": 2, "name": "B"}, {"id": 1, "name": "C"}]
+    answers = iter(["1", "yes"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    ym.delete_video(videos)
+    assert [v["name"] for v in videos] == ["B", "C"]
+    assert ym.find_index_by_id(videos, 1) == 1
+    assert ym.find_index_by_id(videos, 2) == 0
+
+def test_next_id_cache_tracks_changes(monkeypatch):
+    def video(i):
+        return {"id": i, "name": str(i), "time": "", "description": "", "tags": []}
+
+    videos = [video(1), video(2), video(3)]
+    assert ym.next_id(videos) == 4
+
+    # Records replaced directly by the caller are noticed, wherever they are
+    videos[0] = video(4)
+    assert ym.next_id(videos) == 5
+    videos[-1] = video(5)
+    assert ym.next_id(videos) == 6
+
+    answers = iter(["New", "", "", "", "2", "yes"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    ym.add_video(videos)
+    assert videos[-1]["id"] == 6
+    assert ym.next_id(videos) == 7
+
+    # After deletes the next id is recomputed from the remaining videos
+    ym.delete_video(videos)  # deletes id 2
+    assert ym.next_id(videos) == 7
+    videos.pop()  # drops id 6
+    assert ym.next_id(videos) == 6
+
+def test_find_index_by_id_after_direct_replacement():
+    videos = [{"id": 1}, {"id": 2}, {"id": 3}]
+    assert ym.find_index_by_id(videos, 4) is None
+    videos[0] = {"id": 4}
+    assert ym.find_index_by_id(videos, 4) == 0
+    assert ym.find_index_by_id(videos, 1) is None
+
+def test_search_hits_direct_edits_need_mark_dirty():
+    videos = [
+        {"id": 1, "name": "Python Basics", "time": "", "description": "", "tags": []},
+        {"id": 2, "name": "Cooking", "time": "", "description": "python pasta", "tags": []},
+        {"id": 3, "name": "Music", "time": "", "description": "", "tags": []},
+    ]
+    assert [v["id"] for v in ym._search_hits(videos, "python")] == [1, 2]
+
+    # Direct edits are only seen once the list is marked dirty (as it must be to get saved)
+    videos[0]["name"] = "Rust Basics"
+    assert [v["id"] for v in ym._search_hits(videos, "python")] == [1, 2]
+    ym._mark_dirty(videos)
+    assert [v["id"] for v in ym._search_hits(videos, "python")] == [2]
+    assert [v["id"] for v in ym._search_hits(videos, "rust")] == [1]
+    assert ym._search_hits(videos, "s") == videos
+
+def test_load_data_large_file(tmp_data_file):
+    videos = [
+        {"id": i, "name": f"Video {i}", "time": "1:00", "description": "x" * 100, "tags": ["a", "b"]}
+        for i in range(1, 101)
+    ]
+    ym.save_data_atomic(videos, ym.DATA_FILE)
+    # Large enough for _loads_mapped to parse from an mmap rather than read()
+    assert os.path.getsize(ym.DATA_FILE) >= ym.MMAP_THRESHOLD
+    assert ym.load_data(ym.DATA_FILE) == videos
+
+def test_save_data_atomic_durable(tmp_data_file, monkeypatch):
+    synced = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: synced.append(fd) or real_fsync(fd))
+    videos = [{"id": 1, "name": "A", "time": "", "description": "", "tags": []}]
+
+    assert ym.save_data_atomic(videos, ym.DATA_FILE)
+    assert synced == []
+
+    assert ym.save_data_atomic(videos, ym.DATA_FILE, durable=True)
+    # The temp file, plus its directory where the OS supports it
+    assert len(synced) == (2 if hasattr(os, "O_DIRECTORY") else 1)
+    assert ym.load_data(ym.DATA_FILE) == videos
+    # No temp files are left behind
+    assert os.listdir(os.path.dirname(ym.DATA_FILE)) == [os.path.basename(ym.DATA_FILE)]
+
+def test_sort_videos(monkeypatch):
+    videos = [
+        {"id": 1, "name": "b", "time": "2:00", "description": "", "tags": []},
+        {"id": 2, "name": "c", "time": "1:00", "description": "", "tags": []},
+        {"id": 3, "name": "a", "time": "3:00", "description": "", "tags": []},
+    ]
+    answers = iter(["", "", "time", "y", "id", "y"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    ym.sort_videos(videos)  # default: name ascending
+    assert [v["id"] for v in videos] == [3, 1, 2]
+    ym.sort_videos(videos)  # time descending
+    assert [v["time"] for v in videos] == ["3:00", "2:00", "1:00"]
+    ym.sort_videos(videos)  # id descending
+    assert [v["id"] for v in videos] == [3, 2, 1]
+    assert ym.find_index_by_id(videos, 1) == 2
+    assert ym._dirty_videos is videos
+
+def test_sort_videos_missing_field(monkeypatch):
+    # Lists not normalized by load_data may lack the key; they sort as ""
+    videos = [{"id": 1, "name": "b"}, {"id": 2}, {"id": 3, "name": "a"}]
+    answers = iter(["name", ""])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    ym.sort_videos(videos)
+    assert [v["id"] for v in videos] == [2, 3, 1]
+
+@pytest.mark.parametrize("raw, expected", [
+    ("7", 7),
+    ("007", 7),
+    ("", None),
+    ("abc", None),
+    ("1.5", None),
+    ("-3", None),
+])
+def test_parse_id(raw, expected):
+    assert ym._parse_id(raw) == expected
+
+def test_prompt_int(monkeypatch, capsys):
+    answers = iter(["", "", "x", "12"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    assert ym.prompt_int("? ", allow_blank=True) is None
+    assert ym.prompt_int("? ") is None
+    assert ym.prompt_int("? ") is None
+    assert "valid number" in capsys.readouterr().out
+    assert ym.prompt_int("? ") == 12
+
+def test_load_data_keeps_malformed_tags(tmp_data_file, capsys):
+    with open(ym.DATA_FILE, "w", encoding="utf-8") as f:
+        json.dump([
+            {"id": 1, "name": "A", "tags": "music, rock"},
+            {"id": 2, "name": "B", "tags": 7},
+            {"id": 3, "name": "C", "tags": ["x", 5]},
+        ], f)
+    loaded = ym.load_data(ym.DATA_FILE)
+    assert [v["tags"] for v in loaded] == [["music", "rock"], 7, ["x", 5]]
+
+    ym.save_data_atomic(loaded, ym.DATA_FILE)
+    assert [v["tags"] for v in ym.load_data(ym.DATA_FILE)] == [["music", "rock"], 7, ["x", 5]]
+
+    ym.pretty_list(loaded)
+    out = capsys.readouterr().out
+    assert "music, rock" in out
+    assert "x, 5" in out
+
+def test_search_file_fallback_leaves_caches(tmp_data_file, monkeypatch):
+    monkeypatch.setattr(ym, "ijson", None)
+    videos = [{"id": 1, "name": "Python", "time": "", "description": "", "tags": []}]
+    ym.save_data_atomic(videos, ym.DATA_FILE)
+    loaded = ym.load_data(ym.DATA_FILE)
+    assert [v["id"] for v in ym.search_file("python", ym.DATA_FILE)] == [1]
+    assert ym._id_index_owner is loaded
+
+def test_search_file_streaming(tmp_data_file):
+    pytest.importorskip("ijson")
+    assert ym.ijson is not None
+    videos = [
+        {"id": 1, "name": "Python", "time": "", "description": "", "tags": []},
+        {"id": 2, "name": "Other", "time": "", "description": "more python", "tags": []},
+    ]
+    ym.save_data_atomic(videos, ym.DATA_FILE)
+    assert ym.search_file("python", ym.DATA_FILE) == videos
+
+    # Truncated files are reported as no results instead of raising
+    with open(ym.DATA_FILE, "w", encoding="utf-8") as f:
+        f.write('[{"id": 1, "name": "Python"')
+    assert ym.search_file("python", ym.DATA_FILE) == []
+
+@pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="SIGHUP not available")
+def test_main_loop_flushes_on_sighup(tmp_data_file, monkeypatch):
+    previous = {s: signal.getsignal(s) for s in (signal.SIGTERM, signal.SIGHUP)}
+
+    def answers():
+        yield from ["2", "Hangup", "", "", ""]
+        os.kill(os.getpid(), signal.SIGHUP)  # the terminal goes away at the menu prompt
+        yield "1"
+
+    it = answers()
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(it))
+    monkeypatch.setattr(ym, "_last_save", ym.time.monotonic())  # inside the coalescing window
+    try:
+        with pytest.raises(SystemExit):
+            ym.main_loop()
+    finally:
+        for s, handler in previous.items():
+            signal.signal(s, handler)
+    assert [v["name"] for v in ym.load_data(ym.DATA_FILE)] == ["Hangup"]
@@ -18,22 +18,60 @@ from __future__ import annotations
 
 import json
 import logging
+import logging.handlers
+import mmap
 import os
+import signal
 import sys
 import tempfile
-from typing import Any, Dict, List, Optional
+import time
+from bisect import bisect_right
+from itertools import accumulate, islice
+from operator import itemgetter
+from typing import IO, Any, Dict, List, Optional, Tuple
+
+try:  # optional fast JSON backend; stdlib json is used when unavailable
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+try:  # optional streaming parser used for read-only searches on disk
+    import ijson
+except ImportError:  # pragma: no cover - depends on environment
+    ijson = None
 
 # ---------- Configuration ----------
 DATA_FILE = "videos.json"  # use .json extension for clarity
 LOG_FILE = "youtube_manager.log"
-
-# Configure basic logging: DEBUG messages go to log file; user sees minimal prints
-logging.basicConfig(
-    filename=LOG_FILE,
-    filemode="a",
-    level=logging.DEBUG,
-    format="%(asctime)s %(levelname)s %(message)s",
-)
+PRETTY = os.environ.get("YM_PRETTY") == "1"  # indent the data file for debugging; compact otherwise
+SAVE_INTERVAL = 1.0  # seconds; the CLI coalesces changes made within this window into one save
+MMAP_THRESHOLD = 4096  # bytes; smaller files are cheaper to read() than to map
+
+# id -> list position (first occurrence) for the most recently indexed videos list and
+# that list's length when indexed (see find_index_by_id)
+_id_index: Dict[int, int] = {}
+_id_index_owner: Optional[List[Dict[str, Any]]] = None
+_id_index_size = 0
+# (videos list, its length, next id) remembered by next_id and revalidated on use
+_next_id_cache: Optional[Tuple[List[Dict[str, Any]], int, int]] = None
+# Videos list with changes not yet written to DATA_FILE (see flush)
+_dirty_videos: Optional[List[Dict[str, Any]]] = None
+# id -> (name, description, lowercased search text) for search_videos
+_search_index: Dict[Any, Tuple[str, str, str]] = {}
+# (videos list, its length, per-video search texts, their offsets, texts joined by "\x02")
+# for search_videos; dropped by _mark_dirty, so direct edits need a _mark_dirty call
+_search_blob: Optional[Tuple[List[Dict[str, Any]], int, List[str], List[int], str]] = None
+_last_save = 0.0
+
+# Configure logging: DEBUG messages go to log file; user sees minimal prints.
+# Records are buffered and written in batches (errors and exit flush immediately);
+# like basicConfig, this does nothing if the root logger is already configured.
+_root_logger = logging.getLogger()
+if not _root_logger.handlers:
+    _file_handler = logging.FileHandler(LOG_FILE, mode="a", encoding="utf-8", delay=True)
+    _file_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    _root_logger.addHandler(logging.handlers.MemoryHandler(capacity=32, target=_file_handler))
+    _root_logger.setLevel(logging.DEBUG)
 
 
 # ---------- Persistence helpers ----------
@@ -42,18 +80,31 @@ def load_data(file_path: str = DATA_FILE) -> List[Dict[str, Any]]:
     Load list of videos from JSON file.
     If file missing -> return [].
     If file corrupted -> back it up and return [].
+    The loaded list becomes the one the id index and next_id cache describe.
     """
+    videos = _read_videos(file_path)
+    _reindex_from(videos, 0)
+    next_id(videos)
+    return videos
+
+
+def _read_videos(file_path: str) -> List[Dict[str, Any]]:
+    """Read and normalize the videos in file_path (see load_data) without touching the caches."""
     if not os.path.exists(file_path):
         logging.debug("Data file %s not found. Starting with empty list.", file_path)
         return []
 
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        if orjson is not None:
+            with open(file_path, "rb") as f:
+                data = _loads_mapped(f)
+        else:
+            with open(file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
         if not isinstance(data, list):
             logging.warning("Data file %s contained non-list JSON; resetting to empty list.", file_path)
             return []
-        return data
+        return _normalize_records(data, file_path)
     except json.JSONDecodeError as exc:
         # Back up corrupted file to prevent data loss and allow manual recovery
         backup = file_path + ".corrupt"
@@ -72,47 +123,183 @@ def load_data(file_path: str = DATA_FILE) -> List[Dict[str, Any]]:
         return []
 
 
-def save_data_atomic(videos: List[Dict[str, Any]], file_path: str = DATA_FILE) -> None:
+def _loads_mapped(f: IO[bytes]) -> Any:
+    """
+    Parse an open JSON file with orjson straight from a read-only mmap (no read() copy).
+    Files below MMAP_THRESHOLD are simply read, as setting up the mapping costs more.
+    """
+    if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+        return orjson.loads(f.read())  # also covers empty files, which mmap can't map
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as buf:
+            return orjson.loads(buf)
+
+
+def _normalize_records(data: List[Any], file_path: str) -> List[Dict[str, Any]]:
+    """
+    Validate records once at load time so the hot helpers can use v["id"] etc. directly:
+    non-object entries are dropped, missing fields get empty defaults, ids are
+    coerced to int, and missing or malformed ids are replaced with fresh ones.
+    Comma-separated tag strings are split into a list; tag strings are interned so
+    a tag shared by many videos is stored once. Other malformed tags are kept as is.
+    """
+    videos = [v for v in data if isinstance(v, dict)]
+    if len(videos) != len(data):
+        logging.warning("Dropped %d non-object entries from %s.", len(data) - len(videos), file_path)
+    bad = []
+    for v in videos:
+        for field in ("name", "time", "description"):
+            v.setdefault(field, "")
+        tags = v.setdefault("tags", [])
+        if isinstance(tags, str):
+            # Hand-edited files sometimes store tags as "a, b"; keep them as the list the CLI writes
+            logging.warning("Video %r in %s had string tags; split on commas.", v.get("name"), file_path)
+            tags = v["tags"] = [t.strip() for t in tags.split(",") if t.strip()]
+        if isinstance(tags, list):
+            v["tags"] = [sys.intern(t) if isinstance(t, str) else t for t in tags]
+        else:
+            logging.warning("Video %r in %s has non-list tags %r; left unchanged.", v.get("name"), file_path, tags)
+        try:
+            v["id"] = int(v["id"])
+        except (KeyError, TypeError, ValueError):
+            bad.append(v)
+    if bad:
+        new_id = max((v["id"] for v in videos if isinstance(v.get("id"), int)), default=0)
+        for v in bad:
+            new_id += 1
+            logging.warning("Video %r in %s had a malformed id; assigned id=%d.", v.get("name"), file_path, new_id)
+            v["id"] = new_id
+    return videos
+
+
+def _write_atomic(file_path: str, payload: bytes, durable: bool = False) -> None:
+    """
+    Write payload to file_path atomically: it goes into a temp file in the same
+    directory (in a single write), which then replaces file_path via os.replace.
+    With durable=True the temp file and its directory are fsync'ed as well, so the
+    new contents survive a power loss (much slower, hence opt-in).
+    """
+    dir_name = os.path.dirname(os.path.abspath(file_path)) or "."
+    # Temp file lives in the same directory so replace is atomic on most OSes
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{os.path.basename(file_path)}.", suffix=".tmp", dir=dir_name)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_name, file_path)  # atomic replace
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        raise
+
+    o_directory = getattr(os, "O_DIRECTORY", None)
+    if durable and o_directory is not None:  # directory fsync is not supported on Windows
+        dir_fd = os.open(dir_name, o_directory)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def _dumps(videos: List[Dict[str, Any]]) -> bytes:
+    """Encode the videos list as UTF-8 JSON (indented only if PRETTY)."""
+    if orjson is not None:
+        return orjson.dumps(videos, option=orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if PRETTY else 0))
+    if PRETTY:
+        text = json.dumps(videos, ensure_ascii=False, indent=2)
+    else:
+        text = json.dumps(videos, ensure_ascii=False, separators=(",", ":"))
+    return text.encode("utf-8")
+
+
+def save_data_atomic(videos: List[Dict[str, Any]], file_path: str = DATA_FILE, durable: bool = False) -> bool:
     """
     Save videos list to JSON file atomically using a temp file + os.replace.
     This avoids partial writes if the program crashes while writing.
+    Pass durable=True to also fsync the data (see _write_atomic).
+    Returns True on success, False if the data could not be saved.
     """
     try:
-        dir_name = os.path.dirname(os.path.abspath(file_path)) or "."
-        # Create temp file in same directory (so replace is atomic on most OSes)
-        with tempfile.NamedTemporaryFile("w", dir=dir_name, delete=False, encoding="utf-8") as tmp:
-            json.dump(videos, tmp, ensure_ascii=False, indent=2)
-            tmp_name = tmp.name
-        os.replace(tmp_name, file_path)  # atomic replace
+        _write_atomic(file_path, _dumps(videos), durable=durable)
         logging.debug("Saved %d videos to %s", len(videos), file_path)
+        return True
     except Exception as e:
         logging.exception("Failed to save data to %s: %s", file_path, e)
         print("Error: failed to save data. Check log for details.")
+        return False
+
+
+def _mark_dirty(videos: List[Dict[str, Any]]) -> None:
+    """Record that videos changed; the next flush() writes them to DATA_FILE."""
+    global _dirty_videos, _search_blob
+    _dirty_videos = videos
+    _search_blob = None
+
+
+def flush() -> bool:
+    """
+    Write pending changes (if any) to DATA_FILE.
+    Returns False if saving failed; the changes then stay pending for the next flush.
+    """
+    global _dirty_videos, _last_save
+    if _dirty_videos is None:
+        return True
+    _last_save = time.monotonic()
+    if not save_data_atomic(_dirty_videos, DATA_FILE):
+        return False
+    _dirty_videos = None
+    return True
 
 
 # ---------- Utility helpers ----------
+_get_id = itemgetter("id")
+
+
 def next_id(videos: List[Dict[str, Any]]) -> int:
-    """Return next integer id (1-based incremental)."""
-    if not videos:
-        return 1
-    try:
-        max_id = max((int(v.get("id", 0)) for v in videos), default=0)
-    except Exception:
-        # If any id is malformed, fallback to length-based next id
-        logging.exception("Malformed id encountered when computing next_id.")
-        return len(videos) + 1
+    """Return next integer id (1-based incremental). Ids must be ints (see load_data)."""
+    global _next_id_cache
+    if _next_id_cache is not None:
+        owner, length, cached = _next_id_cache
+        # A C-level membership scan catches records the caller replaced directly
+        if owner is videos and length == len(videos) and cached not in map(_get_id, videos):
+            return cached
+    max_id = max(map(_get_id, videos), default=0)
+    _next_id_cache = (videos, len(videos), max_id + 1)
     return max_id + 1
 
 
+def _reindex_from(videos: List[Dict[str, Any]], start: int) -> None:
+    """
+    (Re)build the id index for videos[start:], resetting it if videos is a different list.
+    The first occurrence of a duplicated id wins, as with a front-to-back scan.
+    """
+    global _id_index_owner, _id_index_size
+    if videos is not _id_index_owner or start == 0:
+        _id_index.clear()
+        _id_index_owner = videos
+        start = 0
+    # Walk backwards so earlier records overwrite later ones; entries before start are kept
+    for idx in range(len(videos) - 1, start - 1, -1):
+        vid = videos[idx]["id"]
+        if _id_index.get(vid, start) >= start:
+            _id_index[vid] = idx
+    _id_index_size = len(videos)
+
+
 def find_index_by_id(videos: List[Dict[str, Any]], video_id: int) -> Optional[int]:
     """Return index of video with given id or None if not found."""
-    for idx, v in enumerate(videos):
-        try:
-            if int(v.get("id")) == video_id:
-                return idx
-        except Exception:
-            continue
-    return None
+    if videos is _id_index_owner and len(videos) == _id_index_size:
+        idx = _id_index.get(video_id)
+        if idx is not None and videos[idx]["id"] == video_id:
+            return idx
+        # Confirm a miss with a C-level scan; records replaced directly may be missing from the index
+        if idx is None and video_id not in map(_get_id, videos):
+            return None
+    # Index missing or stale (list changed behind our back): rebuild and retry once
+    _reindex_from(videos, 0)
+    return _id_index.get(video_id)
 
 
 def prompt_nonempty(prompt_text: str) -> str:
@@ -124,6 +311,17 @@ def prompt_nonempty(prompt_text: str) -> str:
         print("Input cannot be empty. Please try again.")
 
 
+def _parse_id(raw: str) -> Optional[int]:
+    """Parse a non-negative integer typed by the user; None if blank or invalid."""
+    if not raw:
+        return None
+    try:
+        num = int(raw)
+    except ValueError:
+        return None
+    return num if num >= 0 else None
+
+
 def prompt_int(prompt_text: str, allow_blank: bool = False) -> Optional[int]:
     """
     Prompt user for integer input.
@@ -133,10 +331,24 @@ def prompt_int(prompt_text: str, allow_blank: bool = False) -> Optional[int]:
     val = input(prompt_text).strip()
     if allow_blank and val == "":
         return None
-    if not val.isdigit():
+    num = _parse_id(val)
+    if num is None:
         print("Please enter a valid number.")
-        return None
-    return int(val)
+    return num
+
+
+def _format_row(v: Dict[str, Any]) -> str:
+    """Format a table row; fields are always present for records normalized by load_data."""
+    return f"{v['id']!s:<6} {v['name'][:34]:<35} {v['time']:<10} {', '.join(v['tags'])}"
+
+
+def _format_row_lenient(v: Dict[str, Any]) -> str:
+    """Same layout as _format_row, for records that may have missing or malformed fields."""
+    vid = v.get("id", "")
+    name = v.get("name", "")[:34]  # truncate long titles for display
+    time = v.get("time", "")
+    tags = ", ".join(map(str, v.get("tags", []))) if isinstance(v.get("tags", []), list) else ""
+    return f"{str(vid):<6} {name:<35} {time:<10} {tags}"
 
 
 def pretty_list(videos: List[Dict[str, Any]]) -> None:
@@ -145,16 +357,19 @@ def pretty_list(videos: List[Dict[str, Any]]) -> None:
         print("\nNo videos found. Add a new video with option 2.\n")
         return
 
-    print("\n" + "*" * 60)
-    print(f"{'ID':<6} {'Title':<35} {'Duration':<10} {'Tags'}")
-    print("-" * 60)
-    for v in videos:
-        vid = v.get("id", "")
-        name = v.get("name", "")[:34]  # truncate long titles for display
-        time = v.get("time", "")
-        tags = ", ".join(v.get("tags", [])) if isinstance(v.get("tags", []), list) else ""
-        print(f"{str(vid):<6} {name:<35} {time:<10} {tags}")
-    print("*" * 60 + "\n")
+    try:
+        rows = [_format_row(v) for v in videos]
+    except (KeyError, TypeError):
+        rows = [_format_row_lenient(v) for v in videos]
+    # Build the whole table first so it is written in one go rather than row by row
+    table = [
+        "\n" + "*" * 60,
+        f"{'ID':<6} {'Title':<35} {'Duration':<10} {'Tags'}",
+        "-" * 60,
+        *rows,
+        "*" * 60 + "\n",
+    ]
+    print("\n".join(table))
 
 
 # ---------- CRUD operations ----------
@@ -165,6 +380,7 @@ def list_all_videos(videos: List[Dict[str, Any]]) -> None:
 
 def add_video(videos: List[Dict[str, Any]]) -> None:
     """Prompt user and add a new video to the list."""
+    global _next_id_cache, _id_index_size
     print("\nAdd a new video (press Ctrl+C to cancel anytime):")
     try:
         name = prompt_nonempty("  Title: ")
@@ -174,7 +390,11 @@ def add_video(videos: List[Dict[str, Any]]) -> None:
         tags = [t.strip() for t in tags_raw.split(",") if t.strip()] if tags_raw else []
         vid = {"id": next_id(videos), "name": name, "time": time, "description": description, "tags": tags}
         videos.append(vid)
-        save_data_atomic(videos)
+        if videos is _id_index_owner and _id_index_size == len(videos) - 1:
+            _id_index.setdefault(vid["id"], len(videos) - 1)
+            _id_index_size += 1
+        _next_id_cache = (videos, len(videos), vid["id"] + 1)
+        _mark_dirty(videos)
         print(f"Added video: id={vid['id']} title={vid['name']}")
     except KeyboardInterrupt:
         print("\nAdd cancelled by user.")
@@ -194,10 +414,10 @@ def update_video(videos: List[Dict[str, Any]]) -> None:
     if raw == "":
         print("Update cancelled.")
         return
-    if not raw.isdigit():
+    vid_id = _parse_id(raw)
+    if vid_id is None:
         print("Please enter a valid numeric ID.")
         return
-    vid_id = int(raw)
     idx = find_index_by_id(videos, vid_id)
     if idx is None:
         print(f"Video with id {vid_id} not found.")
@@ -217,7 +437,7 @@ def update_video(videos: List[Dict[str, Any]]) -> None:
 
     # Update
     video.update({"name": new_name, "time": new_time, "description": new_desc, "tags": new_tags})
-    save_data_atomic(videos)
+    _mark_dirty(videos)
     print(f"Updated video id={vid_id}.")
 
 
@@ -232,10 +452,10 @@ def delete_video(videos: List[Dict[str, Any]]) -> None:
     if raw == "":
         print("Delete cancelled.")
         return
-    if not raw.isdigit():
+    vid_id = _parse_id(raw)
+    if vid_id is None:
         print("Please enter a valid numeric ID.")
         return
-    vid_id = int(raw)
     idx = find_index_by_id(videos, vid_id)
     if idx is None:
         print(f"Video with id {vid_id} not found.")
@@ -245,7 +465,10 @@ def delete_video(videos: List[Dict[str, Any]]) -> None:
     confirm = input(f"Are you sure you want to delete id={vid_id} '{videos[idx].get('name')}'? Type 'yes' to confirm: ")
     if confirm.strip().lower() == "yes":
         deleted = videos.pop(idx)
-        save_data_atomic(videos)
+        _id_index.pop(vid_id, None)
+        _search_index.pop(vid_id, None)
+        _reindex_from(videos, idx)  # positions after idx shifted down by one
+        _mark_dirty(videos)
         print(f"Deleted video id={vid_id}.")
         logging.info("Deleted video: %s", deleted)
     else:
@@ -253,6 +476,81 @@ def delete_video(videos: List[Dict[str, Any]]) -> None:
 
 
 # ---------- Search & Sort ----------
+def _matches(video: Dict[str, Any], q_lower: str) -> bool:
+    """Return True if the lowercased query occurs in the video's title or description."""
+    return q_lower in video.get("name", "").lower() or q_lower in video.get("description", "").lower()
+
+
+def _search_text(video: Dict[str, Any]) -> str:
+    """Return the lowercased title/description of a video, cached in _search_index."""
+    name = video.get("name", "")
+    desc = video.get("description", "")
+    entry = _search_index.get(video.get("id"))
+    # Field strings are replaced (never mutated) on edit, so identity checks detect stale entries
+    if entry is not None and entry[0] is name and entry[1] is desc:
+        return entry[2]
+    text = name.lower() + "\x01" + desc.lower()
+    _search_index[video.get("id")] = (name, desc, text)
+    return text
+
+
+def _search_hits(videos: List[Dict[str, Any]], q_lower: str) -> List[Dict[str, Any]]:
+    """
+    Return videos whose title or description contains q_lower, in list order.
+    All videos are joined into one string so a selective query is a handful of
+    C-level str.find calls instead of a Python loop over the records.
+    The joined string is rebuilt when the list or its length changes, or after
+    _mark_dirty; callers that edit records directly must call _mark_dirty (which
+    they need anyway for the edit to be saved).
+    """
+    global _search_blob
+    if "\x01" in q_lower or "\x02" in q_lower:  # would match across record/field separators
+        return []
+    if _search_blob is None or _search_blob[0] is not videos or _search_blob[1] != len(videos):
+        texts = [_search_text(v) for v in videos]
+        starts = [0, *accumulate(len(t) + 1 for t in texts)]
+        _search_blob = (videos, len(videos), texts, starts, "\x02".join(texts))
+    _, _, texts, starts, blob = _search_blob
+
+    hits = []
+    pos = blob.find(q_lower)
+    while pos != -1:
+        idx = bisect_right(starts, pos) - 1
+        hits.append(videos[idx])
+        if len(hits) > 64 and len(hits) * 8 > idx:
+            # Most videos match: per-hit bookkeeping now costs more than testing each text
+            rest = zip(islice(videos, idx + 1, None), islice(texts, idx + 1, None))
+            hits.extend(v for v, text in rest if q_lower in text)
+            break
+        # Continue with the next record so each video is reported once
+        pos = blob.find(q_lower, starts[idx + 1])
+    return hits
+
+
+def search_file(query: str, file_path: str = DATA_FILE) -> List[Dict[str, Any]]:
+    """
+    Search videos stored in file_path without loading the whole list.
+    Records are streamed one at a time with ijson when it is installed;
+    otherwise the file is read with the regular loader (leaving the caches alone).
+    """
+    q_lower = query.strip().lower()
+    if not q_lower or not os.path.exists(file_path):
+        return []
+    if ijson is None:
+        return [v for v in _read_videos(file_path) if _matches(v, q_lower)]
+
+    hits = []
+    try:
+        with open(file_path, "rb") as f:
+            for v in ijson.items(f, "item"):
+                if isinstance(v, dict) and _matches(v, q_lower):
+                    hits.append(v)
+    except ijson.JSONError as e:
+        logging.error("Failed to stream search results from %s: %s", file_path, e)
+        return []
+    return hits
+
+
 def search_videos(videos: List[Dict[str, Any]]) -> None:
     """Search videos by title or description (case-insensitive)."""
     if not videos:
@@ -263,7 +561,7 @@ def search_videos(videos: List[Dict[str, Any]]) -> None:
         print("Empty query. Cancelled.")
         return
     q_lower = q.lower()
-    hits = [v for v in videos if q_lower in v.get("name", "").lower() or q_lower in v.get("description", "").lower()]
+    hits = _search_hits(videos, q_lower)
     if not hits:
         print("No matches found.")
         return
@@ -271,7 +569,7 @@ def search_videos(videos: List[Dict[str, Any]]) -> None:
 
 
 def sort_videos(videos: List[Dict[str, Any]]) -> None:
-    """Sort videos in memory and save (by key: 'name' or 'time' or 'id')."""
+    """Sort videos in memory and mark them for saving (by key: 'name' or 'time' or 'id')."""
     if not videos:
         print("No videos to sort.")
         return
@@ -281,8 +579,13 @@ def sort_videos(videos: List[Dict[str, Any]]) -> None:
         return
     reverse_raw = input("Reverse order? (y/N): ").strip().lower()
     reverse = reverse_raw == "y"
-    videos.sort(key=lambda v: v.get(key, ""), reverse=reverse)
-    save_data_atomic(videos)
+    try:
+        videos.sort(key=itemgetter(key), reverse=reverse)
+    except KeyError:
+        # Records not normalized by load_data may lack the field
+        videos.sort(key=lambda v: v.get(key, ""), reverse=reverse)
+    _reindex_from(videos, 0)
+    _mark_dirty(videos)
     print(f"Videos sorted by {key} {'descending' if reverse else 'ascending'}.")
 
 
@@ -300,6 +603,15 @@ Welcome to Youtube Manager - choose an option:
 6. Sort videos
 7. Exit
 """
+
+    def on_terminate(signum, frame):
+        # Unwind through the finally below so pending changes are flushed
+        raise SystemExit(128 + signum)
+
+    signal.signal(signal.SIGTERM, on_terminate)
+    sighup = getattr(signal, "SIGHUP", None)  # terminal closed; not available on Windows
+    if sighup is not None:
+        signal.signal(sighup, on_terminate)
     try:
         while True:
             print(MENU)
@@ -321,6 +633,8 @@ Welcome to Youtube Manager - choose an option:
                 break
             else:
                 print("Please enter a number between 1 and 7.")
+            if _dirty_videos is not None and time.monotonic() - _last_save > SAVE_INTERVAL:
+                flush()
     except KeyboardInterrupt:
         # Graceful exit on Ctrl+C
         print("\nInterrupted. Exiting.")
@@ -328,6 +642,9 @@ Welcome to Youtube Manager - choose an option:
         # Catch-all to avoid hard crashes; log info for debugging
         logging.exception("Unexpected error in main loop: %s", e)
         print("An unexpected error occurred. Check log for details.")
+    finally:
+        # Don't lose changes still waiting for the next coalesced save
+        flush()
 
 
 if __name__ == "__main__":